@@ -1,17 +1,123 @@
 import time
 import csv
 import os
-from datetime import datetime
-from queue import Queue
+import io
+import logging
+import signal
 import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from PIL import Image, ImageDraw
 import Quartz
 import mss
+import numpy as np
 from Cocoa import NSEvent
 
+try:
+    # Optional: encodes JPEG straight from the BGRA buffer with libjpeg-turbo
+    from turbojpeg import TurboJPEG, TJPF_BGRA, TJSAMP_420
+except ImportError:
+    TurboJPEG = None
+
+logger = logging.getLogger(__name__)
+
+# Per-process TurboJPEG encoder (None = not created yet, False = unavailable)
+_turbo_jpeg = None
+
+# Cursor marker sprite, handed to each worker process by _init_screenshot_worker
+_cursor_sprite = None
+
+
+def _write_file(filepath, data):
+    """Write a whole buffer to a new file with as few syscalls as possible"""
+    fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
+
+
+def _init_screenshot_worker(cursor_sprite):
+    """Initialize a screenshot worker process"""
+    global _cursor_sprite
+    # Workers share the terminal's process group: let Ctrl+C reach only the
+    # main process, which then waits for in-flight screenshots to be written
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _cursor_sprite = cursor_sprite
+
+
+def _get_turbo_jpeg():
+    """Return this process's TurboJPEG encoder, or None if PyTurboJPEG is unavailable"""
+    global _turbo_jpeg
+    if _turbo_jpeg is None:
+        _turbo_jpeg = False
+        if TurboJPEG is not None:
+            try:
+                _turbo_jpeg = TurboJPEG()
+            except (OSError, RuntimeError) as e:
+                print(f"libturbojpeg not found, falling back to Pillow: {e}")
+    return _turbo_jpeg or None
+
+
+def _process_screenshot(screenshot_data):
+    """Process and save a screenshot (runs in a worker process)"""
+    try:
+        filepath = screenshot_data['filepath']
+        image_format = screenshot_data['image_format']
+        width, height = screenshot_data['size']
+        
+        # Fast path: JPEG straight from the raw BGRA buffer, no PIL Image at all
+        turbo_jpeg = _get_turbo_jpeg() if image_format == 'jpeg' else None
+        if turbo_jpeg and not screenshot_data['draw_cursor']:
+            pixels = np.frombuffer(screenshot_data['data'], dtype=np.uint8).reshape(height, width, 4)
+            encoded = turbo_jpeg.encode(pixels, quality=85, pixel_format=TJPF_BGRA, jpeg_subsample=TJSAMP_420)
+            _write_file(filepath, encoded)
+            return filepath
+        
+        # Screenshot is already at 50% size, cursor position is not
+        cursor_x = screenshot_data['cursor_x'] / 2
+        cursor_y = screenshot_data['cursor_y'] / 2
+        screenshot = Image.frombuffer("RGBA", screenshot_data['size'], screenshot_data['data'], "raw", "BGRA", 0, 1)
+        
+        # Draw cursor marker if enabled
+        if screenshot_data['draw_cursor']:
+            # Blit the precomputed marker centered on the cursor, clipped at the top/left edges
+            half = _cursor_sprite.width // 2
+            x = int(cursor_x) - half
+            y = int(cursor_y) - half
+            screenshot.alpha_composite(
+                _cursor_sprite,
+                dest=(max(x, 0), max(y, 0)),
+                source=(max(-x, 0), max(-y, 0))
+            )
+        
+        # Encode screenshot in memory
+        encoded = io.BytesIO()
+        if image_format == 'jpeg':
+            # JPEG has no alpha channel, non-display areas become black
+            screenshot = screenshot.convert("RGB")
+            screenshot.save(encoded, format="JPEG", quality=85, subsampling=2)
+        elif image_format == 'webp':
+            screenshot.save(encoded, format="WEBP", quality=80, method=0)
+        else:
+            # Low zlib effort: encoding dominates per-frame CPU
+            screenshot.save(encoded, format="PNG", compress_level=screenshot_data['compress_level'], optimize=False)
+        
+        # Save screenshot
+        _write_file(filepath, encoded.getbuffer())
+        return filepath
+    except Exception as e:
+        print(f"Error processing screenshot: {e}")
+        return None
+
 
 class ScreenCapture:
-    def __init__(self, capture_interval=0.1, screenshot_dir="__cursor_data_debug_display", tag="", draw_cursor=False):
+    def __init__(self, capture_interval=0.1, screenshot_dir="__cursor_data_debug_display", tag="", draw_cursor=False,
+                 compress_level=1, image_format="jpeg", idle_interval=1.0):
         """
         Initialize screen capture system
         
@@ -19,10 +125,26 @@ class ScreenCapture:
             capture_interval: Time between captures in seconds (default: 0.1 = 10 FPS)
             screenshot_dir: Directory to save screenshots and CSV
             draw_cursor: Whether to draw a visual marker at cursor position (default: False)
+            compress_level: PNG zlib level 0-9 (default: 1 = fast; 0 = no compression)
+            image_format: 'jpeg' (fastest, no transparency), 'webp' (keeps transparency) or 'png' (lossless)
+            idle_interval: While the cursor is still, capture at most one screenshot per this many seconds
         """
         self.capture_interval = capture_interval
         self.screenshot_dir = screenshot_dir
         self.draw_cursor = draw_cursor
+        self.cursor_sprite = self._build_cursor_sprite()
+        self.compress_level = compress_level
+        self.image_format = image_format.lower()
+        
+        # File extensions for the supported screenshot formats
+        self.image_extensions = {
+            'jpeg': 'jpg',
+            'webp': 'webp',
+            'png': 'png'
+        }
+        if self.image_format not in self.image_extensions:
+            raise ValueError(f"Unsupported image format: {image_format}")
+        self.image_extension = self.image_extensions[self.image_format]
         self.running = False
         self.tag = tag
         
@@ -31,38 +153,47 @@ class ScreenCapture:
             os.makedirs(self.screenshot_dir)
             print(f"Created screenshot directory: {self.screenshot_dir}")
         
-        # Screenshot queue for asynchronous I/O
-        self.screenshot_queue = Queue(maxsize=1000)
+        # Worker processes for screenshot encoding and I/O (encoding is CPU-bound,
+        # so processes scale across cores where threads would contend on the GIL)
+        self.screenshot_executor = None
         self.num_screenshot_workers = 3
+        self.max_pending_screenshots = 1000
+        self.pending_screenshots = set()
         
         # CSV logging
-        self.mouse_positions = []
+        self.mouse_positions = deque()
         self.csv_file_path = os.path.join(self.screenshot_dir, f"mouse_positions_{self.tag}.csv")
         self.csv_update_interval = 0.5  # Write to CSV every 0.5 seconds
         self.data_lock = threading.Lock()
+        self._ts_cache_second = None
+        self._ts_cache_prefix = ""
         
         # Last cursor position for change detection
         self.last_cursor_pos = None
+        self.idle_interval = idle_interval
+        self.last_capture_time = 0
+        self.last_screenshot_path = None
         
         # Initialize mss and get monitor info
         self.sct = mss.mss()
         self._update_screen_info()
     
-    def _get_global_bounds(self):
-        """Return a bounding box enclosing all physical displays (Quartz coordinates)"""
-        err, ids, cnt = Quartz.CGGetActiveDisplayList(16, None, None)
-        if err != Quartz.kCGErrorSuccess:
-            raise OSError(f"CGGetActiveDisplayList failed: {err}")
-        
-        min_x = min_y = float("inf")
-        max_x = max_y = -float("inf")
-        for did in ids[:cnt]:
-            r = Quartz.CGDisplayBounds(did)
-            x0, y0 = r.origin.x, r.origin.y
-            x1, y1 = x0 + r.size.width, y0 + r.size.height
-            min_x, min_y = min(min_x, x0), min(min_y, y0)
-            max_x, max_y = max(max_x, x1), max(max_y, y1)
-        return min_x, min_y, max_x, max_y
+    def _build_cursor_sprite(self):
+        """Draw the cursor marker (red circle with crosshair, at 50% scale) once as an RGBA sprite"""
+        marker_size = 10
+        center = marker_size + 5
+        sprite = Image.new("RGBA", (center * 2 + 1, center * 2 + 1), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(sprite)
+        # Draw a red circle with crosshair at the sprite center
+        draw.ellipse(
+            [center - marker_size, center - marker_size,
+             center + marker_size, center + marker_size],
+            outline='red', width=2
+        )
+        # Draw crosshair
+        draw.line([0, center, center * 2, center], fill='red', width=1)
+        draw.line([center, 0, center, center * 2], fill='red', width=1)
+        return sprite
     
     def _update_screen_info(self):
         """Get screen configuration using mss"""
@@ -81,216 +212,217 @@ class ScreenCapture:
             mon = monitors[i]
             print(f"  Monitor {i}: {mon['width']}x{mon['height']} at ({mon['left']}, {mon['top']})")
         
-        # Get global bounds for Y-coordinate conversion  
-        self.min_x, self.min_y, self.max_x, self.gmax_y = self._get_global_bounds()
-        print(f"  Quartz global bounds: min_x={self.min_x}, min_y={self.min_y}, max_x={self.max_x}, max_y={self.gmax_y}")
-        print(f"  Total Quartz space: {self.max_x - self.min_x} x {self.gmax_y - self.min_y}")
+        # Global bounds, in the same (Quartz) coordinate space mss reports
+        self.min_x = self.combined_monitor['left']
+        self.min_y = self.combined_monitor['top']
+        self.max_x = self.min_x + self.combined_monitor['width']
+        self.gmax_y = self.min_y + self.combined_monitor['height']
+        print(f"  Global bounds: min_x={self.min_x}, min_y={self.min_y}, max_x={self.max_x}, max_y={self.gmax_y}")
+        print(f"  Total space: {self.max_x - self.min_x} x {self.gmax_y - self.min_y}")
+        
+        # Cocoa's Y axis starts at the bottom of the main display, Quartz's at the top
+        self.main_display_height = Quartz.CGDisplayBounds(Quartz.CGMainDisplayID()).size.height
+        
+        # Monitor geometry is fixed for the session, so the frame canvas
+        # and the border overlay are built once here instead of on every frame
+        self._build_display_overlays()
     
-    def _draw_rounded_rectangle(self, draw, bounds, radius, outline_color, width):
-        """Draw a rounded rectangle"""
-        x0, y0, x1, y1 = bounds
+    def _build_display_overlays(self):
+        """Precompute the frame canvas, monitor placements and border pixels (at 50% scale)"""
+        monitors = self.sct.monitors
+        width = self.combined_monitor['width'] // 2
+        height = self.combined_monitor['height'] // 2
         
-        # Draw the four corners as arcs
-        draw.arc([x0, y0, x0 + radius * 2, y0 + radius * 2], 180, 270, fill=outline_color, width=width)
-        draw.arc([x1 - radius * 2, y0, x1, y0 + radius * 2], 270, 360, fill=outline_color, width=width)
-        draw.arc([x0, y1 - radius * 2, x0 + radius * 2, y1], 90, 180, fill=outline_color, width=width)
-        draw.arc([x1 - radius * 2, y1 - radius * 2, x1, y1], 0, 90, fill=outline_color, width=width)
-        
-        # Draw the four sides
-        draw.line([x0 + radius, y0, x1 - radius, y0], fill=outline_color, width=width)  # top
-        draw.line([x0 + radius, y1, x1 - radius, y1], fill=outline_color, width=width)  # bottom
-        draw.line([x0, y0 + radius, x0, y1 - radius], fill=outline_color, width=width)  # left
-        draw.line([x1, y0 + radius, x1, y1 - radius], fill=outline_color, width=width)  # right
-
-    def _capture_all_displays(self):
-        """Capture all displays using mss"""
-        # Monitor 0 captures all displays combined
-        screenshot = self.sct.grab(self.combined_monitor)
+        # Reusable BGRA frame canvas: areas outside every display are never
+        # written, so they stay transparent black
+        self.frame_canvas = np.zeros((height, width, 4), dtype=np.uint8)
         
-        # Convert mss screenshot to PIL Image with alpha channel
-        img = Image.frombytes("RGB", (screenshot.width, screenshot.height), screenshot.rgb)
-        img = img.convert("RGBA")
+        # (monitor, x, y, downsample scratch) placement of each display inside the canvas
+        self.monitor_tiles = []
         
-        # Create a mask for actual display areas
-        # Start with fully transparent image
-        mask = Image.new("L", (img.width, img.height), 0)
-        mask_draw = ImageDraw.Draw(mask)
+        # Pixels covered by the display borders
+        border_mask = np.zeros((height, width), dtype=bool)
         
-        # Get all individual monitors (skip index 0 which is the combined screen)
-        monitors = self.sct.monitors
-        monitor_bounds = []
+        border_radius = 6  # Rounded corner radius (at 50% scale)
+        border_width = 5
+        corner = self._corner_stamp(border_radius, border_width)
         
         for i in range(1, len(monitors)):
             mon = monitors[i]
-            # Calculate position relative to combined monitor
-            x = mon['left'] - self.combined_monitor['left']
-            y = mon['top'] - self.combined_monitor['top']
-            # Draw white rectangle for this display area
-            mask_draw.rectangle(
-                [x, y, x + mon['width'], y + mon['height']],
-                fill=255
-            )
-            # Store bounds for later drawing
-            monitor_bounds.append((x, y, x + mon['width'], y + mon['height']))
-        
-        # Apply mask to make non-display areas transparent
-        img.putalpha(mask)
-        
-        # Draw minimalist rounded borders around each display (Apple aesthetic)
-        draw = ImageDraw.Draw(img, 'RGBA')
-        
-        border_radius = 12  # Rounded corner radius
-        shadow_offset = 3
+            # Calculate position relative to combined monitor (at 50% scale)
+            x0 = (mon['left'] - self.combined_monitor['left']) // 2
+            y0 = (mon['top'] - self.combined_monitor['top']) // 2
+            x1 = x0 + mon['width'] // 2
+            y1 = y0 + mon['height'] // 2
+            self.frame_canvas[y0:y1, x0:x1, 3] = 255
+            scratch = np.empty((mon['height'] // 2, mon['width'] // 2, 4), dtype=np.uint16)
+            self.monitor_tiles.append((mon, x0, y0, scratch))
+            self._mark_rounded_border(border_mask, (x0, y0, x1, y1), corner, border_radius, border_width)
+        
+        # Flat pixel indices, so each frame only touches the border pixels
+        self.border_pixels = np.flatnonzero(border_mask)
+    
+    def _corner_stamp(self, radius, width):
+        """Rasterize the top-left quarter arc of a rounded border as a (radius, radius) boolean stamp"""
+        centers = np.arange(radius) + 0.5
+        dist = np.hypot(radius - centers[:, None], radius - centers[None, :])
+        return (dist <= radius) & (dist >= radius - width)
+    
+    def _mark_rounded_border(self, border_mask, bounds, corner, radius, width):
+        """Mark the pixels of a rounded rectangle border drawn inside bounds"""
+        x0, y0, x1, y1 = bounds
         
-        for bounds in monitor_bounds:
-            x0, y0, x1, y1 = bounds
+        # Four sides as slice fills
+        border_mask[y0:y0 + width, x0 + radius:x1 - radius] = True  # top
+        border_mask[y1 - width:y1, x0 + radius:x1 - radius] = True  # bottom
+        border_mask[y0 + radius:y1 - radius, x0:x0 + width] = True  # left
+        border_mask[y0 + radius:y1 - radius, x1 - width:x1] = True  # right
+        
+        # Four corners as flipped copies of the same stamp
+        border_mask[y0:y0 + radius, x0:x0 + radius] |= corner
+        border_mask[y0:y0 + radius, x1 - radius:x1] |= corner[:, ::-1]
+        border_mask[y1 - radius:y1, x0:x0 + radius] |= corner[::-1, :]
+        border_mask[y1 - radius:y1, x1 - radius:x1] |= corner[::-1, ::-1]
+    
+    def _downsample_half(self, raw, acc):
+        """Shrink a (h, w, 4) uint8 array to 50% by averaging 2x2 pixel blocks into the uint16 array acc"""
+        h, w = raw.shape[0] // 2 * 2, raw.shape[1] // 2 * 2
+        np.add(raw[0:h:2, 0:w:2], raw[1:h:2, 0:w:2], out=acc, dtype=np.uint16)
+        acc += raw[0:h:2, 1:w:2]
+        acc += raw[1:h:2, 1:w:2]
+        acc >>= 2
+        return acc
+
+    def _capture_all_displays(self):
+        """Capture all displays using mss, as a 50% size (h, w, 4) BGRA array"""
+        canvas = self.frame_canvas
+        canvas_height, canvas_width = canvas.shape[:2]
+        
+        # Grab each display on its own instead of the combined virtual screen,
+        # so the gaps between displays are never captured or processed
+        for i, (mon, x0, y0, scratch) in enumerate(self.monitor_tiles):
+            screenshot = self.sct.grab(mon)
             
-            # Draw subtle shadow (multiple layers for blur effect)
-            # shadow_color = (0, 0, 0, 15)  # Very subtle black shadow
-            # for offset in range(shadow_offset, 0, -1):
-            #     shadow_bounds = (
-            #         x0 + offset,
-            #         y0 + offset,
-            #         x1 + offset,
-            #         y1 + offset
-            #     )
-            #     self._draw_rounded_rectangle(
-            #         draw,
-            #         shadow_bounds,
-            #         border_radius,
-            #         shadow_color,
-            #         10
-            #     )
+            # Downsample mss's native BGRA buffer in place (no bytes copy) first,
+            # so every later step (borders, encoding) works on 1/4 of the pixels
+            raw = np.frombuffer(screenshot.raw, dtype=np.uint8).reshape(screenshot.height, screenshot.width, 4)
+            if (screenshot.width, screenshot.height) != (mon['width'], mon['height']):
+                raw = self._fit_grab(i, raw)
+                scratch = self.monitor_tiles[i][3]
+            small = self._downsample_half(raw, scratch)
             
-            # Draw main border (light gray, Apple-style)
-            border_color = (255, 255, 255)  # Light gray with slight transparency
-            self._draw_rounded_rectangle(
-                draw,
-                bounds,
-                border_radius,
-                border_color,
-                10
-            )
+            # Clip to the display's tile, so a mismatched grab can't spill into a neighbour
+            h = min(small.shape[0], mon['height'] // 2, canvas_height - y0)
+            w = min(small.shape[1], mon['width'] // 2, canvas_width - x0)
+            np.copyto(canvas[y0:y0 + h, x0:x0 + w, :3], small[:h, :w, :3], casting='unsafe')
         
-        return img
+        # Minimalist white rounded borders around each display (Apple aesthetic)
+        canvas.reshape(-1, 4)[self.border_pixels] = 255
+        
+        return canvas
+    
+    def _fit_grab(self, tile_index, raw):
+        """Match a grab whose size differs from its display (e.g. Retina pixels) to the tile"""
+        mon, x0, y0, scratch = self.monitor_tiles[tile_index]
+        grab_height, grab_width = raw.shape[:2]
+        scale = grab_width // mon['width']
+        if scale > 1 and (grab_width, grab_height) == (mon['width'] * scale, mon['height'] * scale):
+            # Whole multiple of the display size: a strided view brings it back
+            # to display size without copying
+            return raw[::scale, ::scale]
+        
+        # Anything else (e.g. the display changed mid-session) is cropped to
+        # the tile; resize the scratch once and say so once
+        if scratch.shape[:2] != (grab_height // 2, grab_width // 2):
+            print(f"Display grab is {grab_width}x{grab_height}, expected "
+                  f"{mon['width']}x{mon['height']}; cropping it to fit")
+            scratch = np.empty((grab_height // 2, grab_width // 2, 4), dtype=np.uint16)
+            self.monitor_tiles[tile_index] = (mon, x0, y0, scratch)
+        return raw
     
     def _get_cursor_pos(self):
         """Get current cursor position relative to the captured screenshot"""
-        # Get cursor position using Quartz CGEvent (bottom-left origin)
-        event = Quartz.CGEventCreate(None)
-        cursor_location = Quartz.CGEventGetLocation(event)
+        # Get cursor position using NSEvent (bottom-left origin), which avoids
+        # allocating a new CGEvent every frame, then flip to Quartz coordinates
+        cursor_location = NSEvent.mouseLocation()
         
         cg_x = cursor_location.x
-        cg_y = cursor_location.y
+        cg_y = self.main_display_height - cursor_location.y
 
-        # print(f"Cursor position: x={cg_x}, y={cg_y}")
-        
+        logger.debug("Quartz cursor position: x=%s, y=%s", cg_x, cg_y)
         
         # Adjust for mss combined monitor offset
         # The mss screenshot starts at (combined_monitor['left'], combined_monitor['top'])
         img_x = cg_x - self.combined_monitor['left']
         img_y = cg_y - self.combined_monitor['top']
 
-        print(f"Cursor position: x={img_x}, y={img_y}")
-
+        logger.debug("Cursor position: x=%s, y=%s", img_x, img_y)
         
         return {"x": img_x, "y": img_y}
     
-    def _process_screenshot(self, screenshot_data):
-        """Process and save a screenshot (runs in worker thread)"""
-        try:
-            timestamp = screenshot_data['timestamp']
-            cursor_x = screenshot_data['cursor_x']
-            cursor_y = screenshot_data['cursor_y']
-            screenshot = screenshot_data['screenshot']
-            
-            original_width = screenshot.width
-            original_height = screenshot.height
-            
-            # Draw cursor marker on original size screenshot if enabled
-            if self.draw_cursor:
-                draw = ImageDraw.Draw(screenshot)
-                marker_size = 20
-                # Draw a red circle with crosshair at cursor position
-                draw.ellipse(
-                    [cursor_x - marker_size, cursor_y - marker_size, 
-                     cursor_x + marker_size, cursor_y + marker_size],
-                    outline='red', width=3
-                )
-                # Draw crosshair
-                draw.line([cursor_x - marker_size - 10, cursor_y, 
-                          cursor_x + marker_size + 10, cursor_y], 
-                          fill='red', width=2)
-                draw.line([cursor_x, cursor_y - marker_size - 10, 
-                          cursor_x, cursor_y + marker_size + 10], 
-                          fill='red', width=2)
-            
-            # Resize to 50% of original size for storage efficiency
-            new_size = (original_width // 2, original_height // 2)
-            screenshot = screenshot.resize(new_size)
-            
-            # Create filename using timestamp
-            filename = f"{timestamp}.png"
-            filepath = os.path.join(self.screenshot_dir, filename)
-            
-            # Save screenshot
-            screenshot.save(filepath)
-            return filepath
-        except Exception as e:
-            print(f"Error processing screenshot: {e}")
-            return None
-    
-    def _screenshot_worker(self):
-        """Worker thread that processes screenshots from the queue"""
-        while self.running:
-            try:
-                screenshot_data = self.screenshot_queue.get(timeout=1)
-                self._process_screenshot(screenshot_data)
-                self.screenshot_queue.task_done()
-            except:
-                continue
-    
     def _capture_screenshot_async(self, timestamp, cursor_x, cursor_y):
         """Capture screenshot and queue it for async processing"""
         try:
+            # Skip the frame if the workers are falling behind
+            if len(self.pending_screenshots) >= self.max_pending_screenshots:
+                print(f"Screenshot queue full, skipping frame {timestamp}")
+                return None
+            
             # Capture all displays (fast, in-memory operation)
             screenshot = self._capture_all_displays()
             
-            # Queue the screenshot for processing by worker thread
+            # Hand raw pixels (not PIL objects) to a worker process
+            filepath = os.path.join(self.screenshot_dir, f"{timestamp}.{self.image_extension}")
             screenshot_data = {
-                'timestamp': timestamp,
+                'filepath': filepath,
                 'cursor_x': cursor_x,
                 'cursor_y': cursor_y,
-                'screenshot': screenshot
+                'size': (screenshot.shape[1], screenshot.shape[0]),
+                'data': screenshot.tobytes(),
+                'draw_cursor': self.draw_cursor,
+                'image_format': self.image_format,
+                'compress_level': self.compress_level
             }
-            
-            # Non-blocking put (skip if queue is full)
-            try:
-                self.screenshot_queue.put_nowait(screenshot_data)
-                filepath = os.path.join(self.screenshot_dir, f"{timestamp}.png")
-                return filepath
-            except:
-                print(f"Screenshot queue full, skipping frame {timestamp}")
-                return None
+            future = self.screenshot_executor.submit(_process_screenshot, screenshot_data)
+            self.pending_screenshots.add(future)
+            future.add_done_callback(self._on_screenshot_done)
+            return filepath
                 
         except Exception as e:
             print(f"Error capturing screenshot: {e}")
             return None
 
+    def _on_screenshot_done(self, future):
+        """Report a failed screenshot worker and stop tracking the future"""
+        self.pending_screenshots.discard(future)
+        if not future.cancelled() and future.exception() is not None:
+            print(f"Error processing screenshot: {future.exception()!r}")
+
     def _track_and_capture(self):
         """Continuously track cursor position and capture screenshots"""
+        # Pace captures against fixed deadlines (monotonic clock), so the time spent
+        # capturing is absorbed by the sleep instead of lowering the effective FPS
+        deadline = time.monotonic()
         while self.running:
             try:
                 # Get cursor position and timestamp together
                 cursor_pos = self._get_cursor_pos()
                 timestamp = time.time()
                 
-                # Capture screenshot asynchronously
-                screenshot_path = self._capture_screenshot_async(
-                    timestamp, 
-                    cursor_pos["x"], 
-                    cursor_pos["y"]
-                )
+                # Skip the capture while the cursor is still, reusing the last screenshot
+                if (cursor_pos == self.last_cursor_pos and self.last_screenshot_path
+                        and timestamp - self.last_capture_time < self.idle_interval):
+                    screenshot_path = self.last_screenshot_path
+                else:
+                    # Capture screenshot asynchronously
+                    screenshot_path = self._capture_screenshot_async(
+                        timestamp, 
+                        cursor_pos["x"], 
+                        cursor_pos["y"]
+                    )
+                    if screenshot_path:
+                        self.last_capture_time = timestamp
+                        self.last_screenshot_path = screenshot_path
                 
                 # Store position in buffer
                 with self.data_lock:
@@ -302,11 +434,49 @@ class ScreenCapture:
                     })
                 
                 self.last_cursor_pos = cursor_pos
-                time.sleep(self.capture_interval)
+                
+                deadline += self.capture_interval
+                sleep_for = deadline - time.monotonic()
+                if sleep_for > 0:
+                    time.sleep(sleep_for)
+                else:
+                    # Overran the frame budget: restart the schedule instead of bursting to catch up
+                    deadline = time.monotonic()
                 
             except Exception as e:
                 print(f"Error tracking cursor: {e}")
                 time.sleep(1)
+                deadline = time.monotonic()
+
+    def _fmt_ts(self, ts):
+        """Format a UNIX timestamp as 'YYYY-MM-DD HH:MM:SS.ffffff' in local time"""
+        seconds = int(ts)
+        micros = round((ts - seconds) * 1e6)
+        if micros >= 1000000:
+            seconds += 1
+            micros -= 1000000
+        
+        # The date/time part only changes once per second, so cache it
+        if seconds != self._ts_cache_second:
+            t = time.localtime(seconds)
+            self._ts_cache_prefix = (f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d} "
+                                     f"{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}")
+            self._ts_cache_second = seconds
+        return f"{self._ts_cache_prefix}.{micros:06d}"
+
+    def _write_rows(self, positions):
+        """Append buffered mouse positions to the open CSV file"""
+        self.csv_writer.writerows(
+            [
+                pos['timestamp'],
+                self._fmt_ts(pos['timestamp']),
+                pos['x'],
+                pos['y'],
+                pos.get('screenshot', '')
+            ]
+            for pos in positions
+        )
+        self.csv_fh.flush()
 
     def _write_to_csv(self):
         """Periodically write mouse positions to CSV file"""
@@ -315,31 +485,14 @@ class ScreenCapture:
                 time.sleep(self.csv_update_interval)
                 
                 # Get data from buffer
+                # Swap in an empty buffer so the lock is only held for the swap
                 with self.data_lock:
                     if not self.mouse_positions:
                         continue
-                    data_to_write = self.mouse_positions.copy()
-                    self.mouse_positions.clear()
+                    data_to_write, self.mouse_positions = self.mouse_positions, deque()
                 
-                # Write to CSV file
-                file_exists = os.path.isfile(self.csv_file_path)
-                with open(self.csv_file_path, 'a', newline='') as csvfile:
-                    fieldnames = ['timestamp', 'datetime', 'x', 'y', 'screenshot']
-                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                    
-                    # Write header if file is new
-                    if not file_exists:
-                        writer.writeheader()
-                    
-                    # Write all buffered positions
-                    for pos in data_to_write:
-                        writer.writerow({
-                            'timestamp': pos['timestamp'],
-                            'datetime': datetime.fromtimestamp(pos['timestamp']).strftime('%Y-%m-%d %H:%M:%S.%f'),
-                            'x': pos['x'],
-                            'y': pos['y'],
-                            'screenshot': pos.get('screenshot', '')
-                        })
+                # Write all buffered positions
+                self._write_rows(data_to_write)
                 
                 # print(f"Wrote {len(data_to_write)} entries to {self.csv_file_path}")
                 
@@ -351,28 +504,37 @@ class ScreenCapture:
         """Start the screen capture system"""
         self.running = True
         
-        # Start screenshot worker threads
-        for i in range(self.num_screenshot_workers):
-            worker_thread = threading.Thread(
-                target=self._screenshot_worker, 
-                name=f"ScreenshotWorker-{i}"
-            )
-            worker_thread.daemon = True
-            worker_thread.start()
+        # Keep the CSV file open for the whole session
+        file_exists = os.path.isfile(self.csv_file_path)
+        self.csv_fh = open(self.csv_file_path, 'a', newline='', buffering=1 << 20)
+        self.csv_writer = csv.writer(self.csv_fh)
+        
+        # Write header if file is new
+        if not file_exists:
+            self.csv_writer.writerow(['timestamp', 'datetime', 'x', 'y', 'screenshot'])
+        
+        # Start screenshot worker processes ("spawn" avoids forking a process
+        # that has already initialized Cocoa/Quartz)
+        self.screenshot_executor = ProcessPoolExecutor(
+            max_workers=self.num_screenshot_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_screenshot_worker,
+            initargs=(self.cursor_sprite,)
+        )
 
         # Start cursor position tracking and screenshot capture thread
-        capture_thread = threading.Thread(target=self._track_and_capture)
-        capture_thread.daemon = True
-        capture_thread.start()
+        self.capture_thread = threading.Thread(target=self._track_and_capture)
+        self.capture_thread.daemon = True
+        self.capture_thread.start()
 
         # Start CSV writing thread
-        csv_thread = threading.Thread(target=self._write_to_csv)
-        csv_thread.daemon = True
-        csv_thread.start()
+        self.csv_thread = threading.Thread(target=self._write_to_csv)
+        self.csv_thread.daemon = True
+        self.csv_thread.start()
         
         print(f"Screen capture started")
         print(f"Capture rate: ~{int(1/self.capture_interval)} FPS")
-        print(f"Screenshot workers: {self.num_screenshot_workers} threads")
+        print(f"Screenshot workers: {self.num_screenshot_workers} processes")
         print(f"CSV write interval: {self.csv_update_interval} seconds")
         print(f"Draw cursor marker: {self.draw_cursor}")
         print(f"Output directory: {self.screenshot_dir}")
@@ -389,37 +551,36 @@ class ScreenCapture:
         """Stop the screen capture system"""
         self.running = False
         
-        # Wait for screenshot queue to finish processing
+        # Let the capture thread finish its current frame before shutting down the workers
+        self.capture_thread.join(timeout=2)
+        
+        # Wait for screenshot workers to finish processing
         print("\nStopping... waiting for screenshot queue to finish...")
         try:
-            self.screenshot_queue.join()
+            self.screenshot_executor.shutdown(wait=True)
             print(f"Screenshot queue processed successfully")
         except Exception as e:
             print(f"Error waiting for screenshot queue: {e}")
         
-        # Write any remaining data to CSV
-        with self.data_lock:
-            if self.mouse_positions:
-                try:
-                    file_exists = os.path.isfile(self.csv_file_path)
-                    with open(self.csv_file_path, 'a', newline='') as csvfile:
-                        fieldnames = ['timestamp', 'datetime', 'x', 'y', 'screenshot']
-                        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                        
-                        if not file_exists:
-                            writer.writeheader()
-                        
-                        for pos in self.mouse_positions:
-                            writer.writerow({
-                                'timestamp': pos['timestamp'],
-                                'datetime': datetime.fromtimestamp(pos['timestamp']).strftime('%Y-%m-%d %H:%M:%S.%f'),
-                                'x': pos['x'],
-                                'y': pos['y'],
-                                'screenshot': pos.get('screenshot', '')
-                            })
-                    print(f"Wrote final {len(self.mouse_positions)} entries to {self.csv_file_path}")
-                except Exception as e:
-                    print(f"Error writing final data to CSV: {e}")
+        # Write any remaining data to CSV. Only once both threads have exited:
+        # the CSV thread may still be writing, and the capture thread may still
+        # append positions that would then never be written
+        self.csv_thread.join(timeout=self.csv_update_interval + 1)
+        if self.capture_thread.is_alive() or self.csv_thread.is_alive():
+            print("Capture or CSV thread didn't stop in time, skipping final CSV write")
+        else:
+            with self.data_lock:
+                if self.mouse_positions:
+                    try:
+                        self._write_rows(self.mouse_positions)
+                        print(f"Wrote final {len(self.mouse_positions)} entries to {self.csv_file_path}")
+                    except Exception as e:
+                        print(f"Error writing final data to CSV: {e}")
+            
+            try:
+                self.csv_fh.close()
+            except Exception as e:
+                print(f"Error closing CSV file: {e}")
         
         # Close mss instance
         try:
@@ -437,6 +598,8 @@ if __name__ == "__main__":
     # - 0.05 = 20 FPS
     # - 0.033 = ~30 FPS
     # Set draw_cursor=True to draw a red marker at cursor position (useful for debugging)
+    # For long sessions use capture_server_video.py instead: it pipes frames into a
+    # single ffmpeg-encoded video rather than writing one image file per frame
     capture = ScreenCapture(
         capture_interval=0.1, 
         screenshot_dir="__cursor_data",
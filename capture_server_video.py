@@ -5,18 +5,120 @@ import subprocess
 import signal
 import sys
 import argparse
+import ctypes
+from collections import deque
 from datetime import datetime
-from queue import Queue
 import threading
 from PIL import Image, ImageDraw
 import Quartz
 import mss
 import numpy as np
+from Cocoa import NSEvent
+
+# macOS quality-of-service classes (from <sys/qos.h>)
+QOS_CLASS_USER_INTERACTIVE = 0x21
+
+# Niceness for the FFmpeg process, so it yields the CPU to the capture thread;
+# the frame ring absorbs the resulting encode jitter
+FFMPEG_NICENESS = 5
+
+
+def _set_thread_qos(qos_class):
+    """Set the macOS QoS class of the calling thread (no-op elsewhere)"""
+    if sys.platform != 'darwin':
+        return
+    try:
+        libsystem = ctypes.CDLL('/usr/lib/libSystem.dylib')
+        result = libsystem.pthread_set_qos_class_self_np(qos_class, 0)
+        if result != 0:
+            print(f"Could not set thread QoS class {qos_class:#x}: error {result}")
+    except (OSError, AttributeError) as e:
+        print(f"Could not set thread QoS class: {e}")
+
+
+class FrameRing:
+    """Lock-free ring of preallocated frame buffers for one producer and one consumer thread"""
+    
+    def __init__(self, num_slots, frame_size):
+        self.slots = [bytearray(frame_size) for _ in range(num_slots)]
+        self.num_slots = num_slots
+        # Only the consumer advances head and only the producer advances tail,
+        # so plain int updates are safe under the GIL
+        self.head = 0
+        self.tail = 0
+    
+    def __len__(self):
+        return self.tail - self.head
+    
+    def writable_slot(self):
+        """Return the next free buffer for the producer, or None if the ring is full"""
+        if self.tail - self.head >= self.num_slots:
+            return None
+        return self.slots[self.tail % self.num_slots]
+    
+    def publish(self):
+        """Hand the buffer from writable_slot() over to the consumer"""
+        self.tail += 1
+    
+    def readable_slot(self):
+        """Return the oldest published buffer for the consumer, or None if the ring is empty"""
+        if self.head == self.tail:
+            return None
+        return self.slots[self.head % self.num_slots]
+    
+    def release(self):
+        """Give the buffer from readable_slot() back to the producer"""
+        self.head += 1
+
+
+class CursorRing:
+    """Lock-free ring of cursor samples stored column-wise in preallocated NumPy arrays"""
+    
+    def __init__(self, capacity=1 << 16):
+        # Coordinates stay float64 so the CSV keeps the exact values NSEvent reports
+        self.frame_number = np.empty(capacity, dtype=np.int64)
+        self.timestamp = np.empty(capacity, dtype=np.float64)
+        self.video_timestamp = np.empty(capacity, dtype=np.float64)
+        self.x = np.empty(capacity, dtype=np.float64)
+        self.y = np.empty(capacity, dtype=np.float64)
+        self.capacity = capacity
+        # Same single producer / single consumer scheme as FrameRing
+        self.head = 0
+        self.tail = 0
+    
+    def append(self, frame_number, timestamp, video_timestamp, x, y):
+        """Store one sample, returning False if the ring is full"""
+        if self.tail - self.head >= self.capacity:
+            return False
+        i = self.tail % self.capacity
+        self.frame_number[i] = frame_number
+        self.timestamp[i] = timestamp
+        self.video_timestamp[i] = video_timestamp
+        self.x[i] = x
+        self.y[i] = y
+        self.tail += 1
+        return True
+    
+    def drain(self):
+        """Return all unread samples as CSV row tuples and free their slots"""
+        tail = self.tail
+        if self.head == tail:
+            return []
+        indices = np.arange(self.head, tail) % self.capacity
+        rows = list(zip(
+            self.frame_number[indices].tolist(),
+            self.timestamp[indices].tolist(),
+            self.video_timestamp[indices].tolist(),
+            self.x[indices].tolist(),
+            self.y[indices].tolist(),
+        ))
+        self.head = tail
+        return rows
 
 
 class ScreenCaptureVideo:
     def __init__(self, capture_interval=0.1, output_dir="__cursor_data", tag="", 
-                 video_quality="medium", fps=10):
+                 video_quality="medium", fps=10, hwaccel=False):
         """
         Initialize screen capture system with video encoding
         
@@ -26,19 +128,26 @@ class ScreenCaptureVideo:
             tag: Tag for naming files
             video_quality: 'low' (faster, larger), 'medium' (balanced), 'high' (slower, smaller)
             fps: Frames per second for the output video (should match 1/capture_interval)
+            hwaccel: Encode H.264 with VideoToolbox (hardware, .mp4) instead of VP9,
+                without the transparent rounded corners and display borders
         """
         self.capture_interval = capture_interval
         self.output_dir = output_dir
         self.fps = fps
+        self.hwaccel = hwaccel
         self.running = False
         
-        # Quality presets for H.264 encoding
+        # Quality presets: crf/cpu_used for VP9 (cpu-used: higher = faster, larger),
+        # bitrate for VideoToolbox, which has no CRF mode
         self.quality_presets = {
-            'low': {'crf': 28, 'preset': 'ultrafast'},  # Fast, larger files
-            'medium': {'crf': 23, 'preset': 'medium'},  # Balanced
-            'high': {'crf': 18, 'preset': 'slow'}       # Slower, better compression
+            'low': {'crf': 28, 'cpu_used': 8, 'bitrate': '4M'},     # Fast, larger files
+            'medium': {'crf': 23, 'cpu_used': 5, 'bitrate': '8M'},  # Balanced
+            'high': {'crf': 18, 'cpu_used': 2, 'bitrate': '16M'}    # Slower, better compression
         }
-        self.video_quality = self.quality_presets.get(video_quality, self.quality_presets['medium'])
+        if video_quality not in self.quality_presets:
+            video_quality = 'medium'
+        self.video_quality_name = video_quality
+        self.video_quality = self.quality_presets[video_quality]
         
         # Create output directory
         if not os.path.exists(self.output_dir):
@@ -49,8 +158,10 @@ class ScreenCaptureVideo:
         original_tag = tag
         idx = 1
         while True:
-            video_path = os.path.join(self.output_dir, f"screen_capture_{tag}.webm")
-            if not os.path.exists(video_path):
+            if not any(
+                os.path.exists(os.path.join(self.output_dir, f"screen_capture_{tag}.{ext}"))
+                for ext in ('webm', 'mp4')
+            ):
                 break
             tag = f"{original_tag}_{idx}"
             idx += 1
@@ -59,18 +170,22 @@ class ScreenCaptureVideo:
         if tag != original_tag:
             print(f"Tag '{original_tag}' already exists, using '{tag}' instead")
         
-        # Frame queue for video encoding
-        self.frame_queue = Queue(maxsize=300)  # Buffer up to 30 seconds at 10 FPS
+        # Frame ring for video encoding (created once the frame size is known)
+        self.frame_ring = None
+        self.max_buffered_frames = 20  # Buffer up to 2 seconds at 10 FPS
+        self.frames_available = threading.Event()
         
         # CSV logging
-        self.mouse_positions = []
+        self.cursor_ring = CursorRing()
         self.csv_file_path = os.path.join(self.output_dir, f"mouse_positions_{self.tag}.csv")
-        self.csv_update_interval = 0.5
-        self.data_lock = threading.Lock()
+        self.csv_update_interval = 0.5  # Flushed from the capture thread
         
-        # Video output (use .webm for transparency support)
-        self.video_file_path = os.path.join(self.output_dir, f"screen_capture_{self.tag}.webm")
+        # Video output (use .webm for transparency support, .mp4 for hardware H.264)
+        video_extension = 'mp4' if self.hwaccel else 'webm'
+        self.video_file_path = os.path.join(self.output_dir, f"screen_capture_{self.tag}.{video_extension}")
         self.ffmpeg_process = None
+        self._grab_size_warned = False
+        self.ffmpeg_log = deque(maxlen=50)  # Last lines of FFmpeg's stderr
         self.start_time = None
         self.frame_count = 0
         self.queued_frame_count = 0  # Frames queued for encoding
@@ -78,22 +193,10 @@ class ScreenCaptureVideo:
         # Initialize mss
         self.sct = mss.mss()
         self._update_screen_info()
-    
-    def _get_global_bounds(self):
-        """Return a bounding box enclosing all physical displays"""
-        err, ids, cnt = Quartz.CGGetActiveDisplayList(16, None, None)
-        if err != Quartz.kCGErrorSuccess:
-            raise OSError(f"CGGetActiveDisplayList failed: {err}")
-        
-        min_x = min_y = float("inf")
-        max_x = max_y = -float("inf")
-        for did in ids[:cnt]:
-            r = Quartz.CGDisplayBounds(did)
-            x0, y0 = r.origin.x, r.origin.y
-            x1, y1 = x0 + r.size.width, y0 + r.size.height
-            min_x, min_y = min(min_x, x0), min(min_y, y0)
-            max_x, max_y = max(max_x, x1), max(max_y, y1)
-        return min_x, min_y, max_x, max_y
+        
+        # Preallocated full-resolution BGRA frame buffers, reused for the whole session
+        frame_size = self.combined_monitor['width'] * self.combined_monitor['height'] * 4
+        self.frame_ring = FrameRing(self.max_buffered_frames, frame_size)
     
     def _update_screen_info(self):
         """Get screen configuration using mss"""
@@ -106,34 +209,36 @@ class ScreenCaptureVideo:
         print(f"Combined screen area: {self.combined_monitor['width']}x{self.combined_monitor['height']}")
         print(f"Output video size: {self.width}x{self.height}")
         
-        # Get global bounds for coordinate conversion
-        self.min_x, self.min_y, self.max_x, self.gmax_y = self._get_global_bounds()
+        # Cocoa's Y axis starts at the bottom of the main display, Quartz's at the top
+        self.main_display_height = Quartz.CGDisplayBounds(Quartz.CGMainDisplayID()).size.height
+        # Origin of the combined capture area, subtracted from every cursor sample
+        self._origin_x = self.combined_monitor['left']
+        self._origin_y = self.combined_monitor['top']
+        
+        # Monitor geometry is fixed for the session, so the rounded-corner
+        # alpha mask and the border pixels are rasterized once here, and the
+        # capture routine is picked once for this display setup
+        self._single_monitor = len(monitors) == 2
+        if self.hwaccel:
+            self._capture_impl = self._capture_plain
+        else:
+            self._build_display_overlays()
+            if self._single_monitor:
+                self._capture_impl = self._capture_single_display
+            else:
+                self._capture_impl = self._capture_all_displays
     
-    def _draw_rounded_rectangle(self, draw, bounds, radius, outline_color, width):
-        """Draw a rounded rectangle with rounded corners"""
-        x0, y0, x1, y1 = bounds
+    def _build_display_overlays(self):
+        """Precompute the display alpha mask and border pixels"""
+        full_width = self.combined_monitor['width']
+        full_height = self.combined_monitor['height']
         
-        # Use PIL's built-in rounded_rectangle method for better rendering
-        # This ensures corners and edges connect properly
-        draw.rounded_rectangle(
-            [x0, y0, x1, y1],
-            radius=radius,
-            outline=outline_color,
-            width=width
-        )
-    
-    def _capture_all_displays(self):
-        """Capture all displays and return as PIL Image"""
-        screenshot = self.sct.grab(self.combined_monitor)
-        img = Image.frombytes("RGB", (screenshot.width, screenshot.height), screenshot.rgb)
-        img = img.convert("RGBA")
-        
-        # Create mask for display areas with rounded corners
-        mask = Image.new("L", (img.width, img.height), 0)
+        mask = Image.new("L", (full_width, full_height), 0)
         mask_draw = ImageDraw.Draw(mask)
+        border = Image.new("L", (full_width, full_height), 0)
+        border_draw = ImageDraw.Draw(border)
         
         monitors = self.sct.monitors
-        monitor_bounds = []
         border_radius = 24
         
         for i in range(1, len(monitors)):
@@ -142,57 +247,157 @@ class ScreenCaptureVideo:
             y = mon['top'] - self.combined_monitor['top']
             bounds = (x, y, x + mon['width'], y + mon['height'])
             
-            # Draw rounded rectangle mask to clip content
+            # Rounded rectangle mask to clip content
             mask_draw.rounded_rectangle(
                 [bounds[0], bounds[1], bounds[2], bounds[3]],
                 radius=border_radius,
                 fill=255
             )
-            monitor_bounds.append(bounds)
-        
-        img.putalpha(mask)
-        
-        # Draw borders on top of the clipped content
-        draw = ImageDraw.Draw(img, 'RGBA')
-        border_color = (255, 255, 255)
-        
-        for bounds in monitor_bounds:
-            self._draw_rounded_rectangle(draw, bounds, border_radius, border_color, 6)
-        
-        # Resize to 50% for efficiency
-        new_size = (self.width, self.height)
-        img = img.resize(new_size, Image.Resampling.LANCZOS)
+            # Border drawn on top of the clipped content
+            self._draw_rounded_rectangle(border_draw, bounds, border_radius, 255, 6)
+        
+        self._alpha_mask = np.asarray(mask)
+        # Flat pixel indices, so each frame only touches the border pixels
+        self._border_pixels = np.flatnonzero(np.asarray(border))
+        
+        if self._single_monitor:
+            # A single display fills the whole frame, so only the rounded corners
+            # and the border differ from the (opaque) grab: store those bytes as
+            # flat indices and values to patch into each copied frame
+            corner_pixels = np.setdiff1d(np.flatnonzero(self._alpha_mask != 255), self._border_pixels)
+            border_bytes = (self._border_pixels[:, None] * 4 + np.arange(4)).ravel()
+            self._fixup_indices = np.concatenate([corner_pixels * 4 + 3, border_bytes])
+            self._fixup_values = np.concatenate([
+                self._alpha_mask.ravel()[corner_pixels],
+                np.full(border_bytes.size, 255, dtype=np.uint8),
+            ])
+    
+    def _draw_rounded_rectangle(self, draw, bounds, radius, outline_color, width):
+        """Draw a rounded rectangle with rounded corners"""
+        x0, y0, x1, y1 = bounds
         
-        return img
+        # Use PIL's built-in rounded_rectangle method for better rendering
+        # This ensures corners and edges connect properly
+        draw.rounded_rectangle(
+            [x0, y0, x1, y1],
+            radius=radius,
+            outline=outline_color,
+            width=width
+        )
+    
+    def _grab_frame(self):
+        """Grab all displays as a (height, width, 4) BGRA array at the combined screen size, or None"""
+        screenshot = self.sct.grab(self.combined_monitor)
+        raw = np.frombuffer(screenshot.raw, dtype=np.uint8).reshape(screenshot.height, screenshot.width, 4)
+        full_width = self.combined_monitor['width']
+        full_height = self.combined_monitor['height']
+        if raw.shape[:2] == (full_height, full_width):
+            return raw
+        
+        # FFmpeg reads fixed-size frames, so a grab of any other size must never
+        # reach a ring slab. Whole multiples (e.g. Retina pixels) are scaled back
+        # with a strided view, anything else is dropped
+        scale = screenshot.width // full_width
+        if scale > 1 and raw.shape[:2] == (full_height * scale, full_width * scale):
+            return raw[::scale, ::scale]
+        if not self._grab_size_warned:
+            print(f"Screen grab is {screenshot.width}x{screenshot.height}, expected "
+                  f"{full_width}x{full_height}; dropping frames until it matches")
+            self._grab_size_warned = True
+        return None
+    
+    def _capture_plain(self, out):
+        """Capture all displays into out as-is (no alpha in H.264, so no mask or border)"""
+        raw = self._grab_frame()
+        if raw is None:
+            return False
+        np.copyto(np.frombuffer(out, dtype=np.uint8).reshape(raw.shape), raw)
+        return True
+    
+    def _capture_single_display(self, out):
+        """Capture the only display into out, with rounded corners and border"""
+        raw = self._grab_frame()
+        if raw is None:
+            return False
+        # Screen grabs are fully opaque, so one bulk copy plus a sparse patch of
+        # the corner and border bytes gives the same frame as the generic path
+        frame = np.frombuffer(out, dtype=np.uint8)
+        np.copyto(frame.reshape(raw.shape), raw)
+        frame[self._fixup_indices] = self._fixup_values
+        return True
+    
+    def _capture_all_displays(self, out):
+        """Capture all displays into out as a full-resolution raw BGRA frame"""
+        raw = self._grab_frame()
+        if raw is None:
+            return False
+        
+        # Compose the frame in out (FFmpeg reads BGRA, matching mss's native
+        # pixel layout): copy the pixels, clip to the displays' rounded corners
+        # and draw white borders on top
+        frame = np.frombuffer(out, dtype=np.uint8).reshape(raw.shape)
+        frame[:, :, :3] = raw[:, :, :3]
+        frame[:, :, 3] = self._alpha_mask
+        frame.reshape(-1, 4)[self._border_pixels] = 255
+        return True
     
     def _get_cursor_pos(self):
         """Get current cursor position"""
-        event = Quartz.CGEventCreate(None)
-        cursor_location = Quartz.CGEventGetLocation(event)
+        # NSEvent reads the location without allocating a new CGEvent every
+        # frame; flip from Cocoa (bottom-left origin) to Quartz coordinates
+        cursor_location = NSEvent.mouseLocation()
         
-        img_x = cursor_location.x - self.combined_monitor['left']
-        img_y = cursor_location.y - self.combined_monitor['top']
+        img_x = cursor_location.x - self._origin_x
+        img_y = self.main_display_height - cursor_location.y - self._origin_y
         
         return {"x": img_x, "y": img_y}
     
     def _start_ffmpeg(self):
-        """Start FFmpeg process for video encoding with transparency support"""
-        # FFmpeg command for VP9 encoding with alpha channel (transparency)
-        # Use variable frame rate (VFR) to match actual capture timing
-        cmd = [
+        """Start FFmpeg process for video encoding (VP9 with transparency, or hardware H.264)"""
+        input_args = [
             'ffmpeg',
+            # Only real diagnostics on stderr: progress stats are \r-terminated
+            # and would pile up as one ever-growing line in the log tail
+            '-nostats', '-hide_banner', '-loglevel', 'warning',
             '-f', 'rawvideo',
             '-vcodec', 'rawvideo',
-            '-s', f'{self.width}x{self.height}',
-            '-pix_fmt', 'rgba',  # RGBA for transparency
+            '-s', f"{self.combined_monitor['width']}x{self.combined_monitor['height']}",
+            '-pix_fmt', 'bgra',  # BGRA (with alpha for transparency), as captured by mss
             '-r', str(self.fps),  # Input frame rate
             '-i', '-',  # Read from stdin
             '-an',  # No audio
-            '-vcodec', 'libvpx-vp9',  # VP9 codec supports alpha
-            '-pix_fmt', 'yuva420p',  # Output with alpha channel
-            '-crf', str(self.video_quality['crf']),
-            '-b:v', '0',  # Use CRF rate control
-            '-auto-alt-ref', '0',  # Disable alt-ref frames for transparency
+            # Resize to 50% for efficiency, inside FFmpeg (SIMD, multithreaded)
+            '-vf', f'scale={self.width}:{self.height}:flags=area',
+        ]
+        
+        if self.hwaccel:
+            # Hardware H.264 encoding on the macOS media engine (no alpha channel)
+            codec_args = [
+                '-vcodec', 'h264_videotoolbox',
+                '-pix_fmt', 'nv12',
+                '-realtime', '1',
+                '-b:v', self.video_quality['bitrate'],
+            ]
+        else:
+            # VP9 encoding with alpha channel (transparency)
+            codec_args = [
+                '-vcodec', 'libvpx-vp9',  # VP9 codec supports alpha
+                '-pix_fmt', 'yuva420p',  # Output with alpha channel
+                '-crf', str(self.video_quality['crf']),
+                '-b:v', '0',  # Use CRF rate control
+                '-auto-alt-ref', '0',  # Alt-ref frames are not supported with alpha, must stay off
+                # Realtime settings so the encoder keeps up with capture
+                '-deadline', 'realtime',
+                '-cpu-used', str(self.video_quality['cpu_used']),
+                '-row-mt', '1',  # Multithreaded encoding within tiles
+                '-tile-columns', '2',
+                '-threads', str(os.cpu_count() or 4),
+                '-lag-in-frames', '0',  # No look-ahead buffering
+                '-error-resilient', '1',
+            ]
+        
+        # Use variable frame rate (VFR) to match actual capture timing
+        cmd = input_args + codec_args + [
             '-vsync', 'vfr',  # Variable frame rate - important!
             '-y',  # Overwrite output file
             self.video_file_path
@@ -201,150 +406,192 @@ class ScreenCaptureVideo:
         self.ffmpeg_process = subprocess.Popen(
             cmd,
             stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
             stderr=subprocess.PIPE,
-            bufsize=10**8
+            bufsize=0,  # Unbuffered: frames go from the ring straight to the pipe
+            # Own session, so Ctrl+C doesn't reach FFmpeg: it stops once stop()
+            # has drained the frame ring and closed stdin
+            start_new_session=True
         )
+        
+        # Keep reading FFmpeg's log: if the stderr pipe fills up, FFmpeg blocks
+        # and stops consuming frames. Only the tail is kept for error reports
+        stderr_thread = threading.Thread(target=self._drain_ffmpeg_stderr)
+        stderr_thread.daemon = True
+        stderr_thread.start()
+        
+        try:
+            os.setpriority(os.PRIO_PROCESS, self.ffmpeg_process.pid, FFMPEG_NICENESS)
+        except OSError as e:
+            print(f"Could not lower FFmpeg priority: {e}")
         print(f"FFmpeg started, encoding to: {self.video_file_path}")
     
+    def _drain_ffmpeg_stderr(self):
+        """Read FFmpeg's stderr until it exits, keeping the last lines"""
+        for line in iter(self.ffmpeg_process.stderr.readline, b''):
+            self.ffmpeg_log.append(line.decode(errors='replace').rstrip())
+    
     def _video_encoder_worker(self):
         """Worker thread that encodes frames to video"""
         self._start_ffmpeg()
         
-        while self.running:
-            try:
-                frame_data = self.frame_queue.get(timeout=1)
-                if frame_data is None:  # Poison pill to stop
+        # Bind hot-loop lookups to locals once
+        ring = self.frame_ring
+        readable_slot = ring.readable_slot
+        release = ring.release
+        frames_available = self.frames_available
+        write = self.ffmpeg_process.stdin.write
+        
+        # Keep draining after stop() until every buffered frame is encoded
+        while self.running or len(ring):
+            frames_available.wait(timeout=1)
+            frames_available.clear()
+            
+            while True:
+                frame = readable_slot()
+                if frame is None:
                     break
                 
-                # Convert PIL Image to RGBA numpy array (preserve transparency)
-                img = frame_data['image']
-                if img.mode != 'RGBA':
-                    img = img.convert('RGBA')
-                
-                # Convert to numpy array and write to FFmpeg
-                frame = np.array(img)
-                self.ffmpeg_process.stdin.write(frame.tobytes())
-                self.frame_count += 1
-                
-                self.frame_queue.task_done()
-                
-            except Exception as e:
-                if self.running:  
+                try:
+                    # Frames are already raw BGRA, write them to FFmpeg as-is.
+                    # The raw pipe may accept only part of a frame per write
+                    view = memoryview(frame)
+                    while view:
+                        view = view[write(view):]
+                    self.frame_count += 1
+                    
+                except Exception as e:
                     print(f"Error encoding frame: {e}")
-                continue
+                finally:
+                    release()
         
         # Close FFmpeg stdin to signal end of input
         try:
             self.ffmpeg_process.stdin.close()
             self.ffmpeg_process.wait(timeout=10)
+            if self.ffmpeg_process.returncode:
+                print(f"FFmpeg exited with code {self.ffmpeg_process.returncode}:")
+                print("\n".join(self.ffmpeg_log))
         except Exception as e:
             print(f"Error closing FFmpeg: {e}")
     
     def _capture_loop(self):
         """Main capture loop"""
+        # Keep the capture thread from being preempted by the encoder
+        _set_thread_qos(QOS_CLASS_USER_INTERACTIVE)
+        
+        # Bind hot-loop lookups to locals once
+        writable_slot = self.frame_ring.writable_slot
+        publish = self.frame_ring.publish
+        notify_encoder = self.frames_available.set
+        capture = self._capture_impl
+        get_cursor_pos = self._get_cursor_pos
+        append_cursor = self.cursor_ring.append
+        flush_csv = self._flush_csv
+        csv_interval = self.csv_update_interval
+        start_time = self.start_time
+        interval = self.capture_interval
+        wall_time = time.time
+        monotonic = time.monotonic
+        sleep = time.sleep
+        
+        # Pace captures against fixed deadlines (monotonic clock), so the time spent
+        # capturing doesn't lower the frame rate below the -r rate given to FFmpeg
+        deadline = monotonic()
+        last_csv_flush = deadline
         while self.running:
             try:
-                # Capture frame
-                img = self._capture_all_displays()
-                cursor_pos = self._get_cursor_pos()
-                timestamp = time.time()
+                # Capture frame straight into the next free ring buffer
+                frame = writable_slot()
+                captured = frame is not None and capture(frame)
+                cursor_pos = get_cursor_pos()
+                timestamp = wall_time()
                 
                 # Calculate video timestamp (seconds from start)
-                video_timestamp = timestamp - self.start_time if self.start_time else 0
+                video_timestamp = timestamp - start_time if start_time else 0
                 
                 # Queue frame for encoding
                 frame_queued = False
-                try:
-                    frame_data = {
-                        'image': img,
-                        'timestamp': timestamp,
-                        'video_timestamp': video_timestamp
-                    }
-                    self.frame_queue.put_nowait(frame_data)
+                if captured:
+                    publish()
+                    notify_encoder()
                     frame_number = self.queued_frame_count
                     self.queued_frame_count += 1
                     frame_queued = True
-                except:
-                    print(f"Frame queue full, dropping frame at {video_timestamp:.2f}s")
+                else:
+                    if frame is None:
+                        print(f"Frame queue full, dropping frame at {video_timestamp:.2f}s")
                     frame_number = -1  # Mark as dropped
                 
                 # Store cursor position with frame number (only if frame was queued)
                 if frame_queued:
-                    with self.data_lock:
-                        self.mouse_positions.append({
-                            "frame_number": frame_number,
-                            "timestamp": timestamp,
-                            "video_timestamp": video_timestamp,
-                            "x": cursor_pos["x"],
-                            "y": cursor_pos["y"]
-                        })
+                    if not append_cursor(frame_number, timestamp, video_timestamp,
+                                         cursor_pos["x"], cursor_pos["y"]):
+                        print(f"Cursor buffer full, dropping sample for frame {frame_number}")
+                
+                # Write out cursor samples here rather than in a separate thread;
+                # the sleep below absorbs the (small) cost
+                if monotonic() - last_csv_flush >= csv_interval:
+                    flush_csv()
+                    last_csv_flush = monotonic()
                 
-                time.sleep(self.capture_interval)
+                deadline += interval
+                sleep_for = deadline - monotonic()
+                if sleep_for > 0:
+                    sleep(sleep_for)
+                else:
+                    # Overran the frame budget: restart the schedule instead of bursting to catch up
+                    deadline = monotonic()
                 
             except Exception as e:
                 print(f"Error in capture loop: {e}")
-                time.sleep(1)
+                sleep(1)
+                deadline = monotonic()
     
-    def _write_to_csv(self):
-        """Periodically write mouse positions to CSV"""
-        while self.running:
+    def _flush_csv(self):
+        """Append all buffered cursor samples to the open CSV file"""
+        rows = self.cursor_ring.drain()
+        if rows:
             try:
-                time.sleep(self.csv_update_interval)
-                
-                with self.data_lock:
-                    if not self.mouse_positions:
-                        continue
-                    data_to_write = self.mouse_positions.copy()
-                    self.mouse_positions.clear()
-                
-                file_exists = os.path.isfile(self.csv_file_path)
-                with open(self.csv_file_path, 'a', newline='') as csvfile:
-                    fieldnames = ['frame_number', 'timestamp', 'datetime', 'video_timestamp', 'x', 'y']
-                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                    
-                    if not file_exists:
-                        writer.writeheader()
-                    
-                    for pos in data_to_write:
-                        writer.writerow({
-                            'frame_number': pos['frame_number'],
-                            'timestamp': pos['timestamp'],
-                            'datetime': datetime.fromtimestamp(pos['timestamp']).strftime('%Y-%m-%d %H:%M:%S.%f'),
-                            'video_timestamp': pos['video_timestamp'],
-                            'x': pos['x'],
-                            'y': pos['y']
-                        })
-                
+                self.csv_writer.writerows(rows)
+                self.csv_fh.flush()
             except Exception as e:
                 print(f"Error writing to CSV: {e}")
-                time.sleep(1)
+        return len(rows)
     
     def start(self):
         """Start the screen capture system"""
         self.running = True
         self.start_time = time.time()
         
+        # Keep the CSV file open for the whole session
+        file_exists = os.path.isfile(self.csv_file_path)
+        self.csv_fh = open(self.csv_file_path, 'a', newline='', buffering=1 << 20)
+        self.csv_writer = csv.writer(self.csv_fh)
+        
+        # Write header if file is new
+        if not file_exists:
+            self.csv_writer.writerow(['frame_number', 'timestamp', 'video_timestamp', 'x', 'y'])
+        
         # Start video encoder thread
-        encoder_thread = threading.Thread(target=self._video_encoder_worker)
-        encoder_thread.daemon = True
-        encoder_thread.start()
+        self.encoder_thread = threading.Thread(target=self._video_encoder_worker)
+        self.encoder_thread.daemon = True
+        self.encoder_thread.start()
         
         # Start capture thread
-        capture_thread = threading.Thread(target=self._capture_loop)
-        capture_thread.daemon = True
-        capture_thread.start()
-        
-        # Start CSV writer thread
-        csv_thread = threading.Thread(target=self._write_to_csv)
-        csv_thread.daemon = True
-        csv_thread.start()
+        self.capture_thread = threading.Thread(target=self._capture_loop)
+        self.capture_thread.daemon = True
+        self.capture_thread.start()
         
         print(f"\n{'='*60}")
         print(f"Screen Capture Started (Video Mode)")
         print(f"{'='*60}")
         print(f"Capture rate: {self.fps} FPS")
-        print(f"Video quality: {self.video_quality}")
+        if self.hwaccel:
+            quality_detail = f"{self.video_quality['bitrate']}bps, VideoToolbox H.264"
+        else:
+            quality_detail = f"CRF {self.video_quality['crf']}, VP9"
+        print(f"Video quality: {self.video_quality_name} ({quality_detail})")
         print(f"Output video: {self.video_file_path}")
         print(f"Output CSV: {self.csv_file_path}")
         print(f"Press Ctrl+C to stop")
@@ -365,43 +612,29 @@ class ScreenCaptureVideo:
         print("\nStopping capture...")
         self.running = False
         
-        # Wait for frame queue to empty
-        print("Waiting for frames to finish encoding...")
-        try:
-            self.frame_queue.join()
-        except Exception as e:
-            print(f"Error waiting for frame queue: {e}")
-        
-        # Send poison pill to encoder
-        try:
-            self.frame_queue.put(None, timeout=1)
-        except:
-            pass
+        # Let the capture thread finish its current frame
+        self.capture_thread.join(timeout=2)
         
-        # Write remaining CSV data
-        with self.data_lock:
-            if self.mouse_positions:
-                try:
-                    file_exists = os.path.isfile(self.csv_file_path)
-                    with open(self.csv_file_path, 'a', newline='') as csvfile:
-                        fieldnames = ['frame_number', 'timestamp', 'datetime', 'video_timestamp', 'x', 'y']
-                        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                        
-                        if not file_exists:
-                            writer.writeheader()
-                        
-                        for pos in self.mouse_positions:
-                            writer.writerow({
-                                'frame_number': pos['frame_number'],
-                                'timestamp': pos['timestamp'],
-                                'datetime': datetime.fromtimestamp(pos['timestamp']).strftime('%Y-%m-%d %H:%M:%S.%f'),
-                                'video_timestamp': pos['video_timestamp'],
-                                'x': pos['x'],
-                                'y': pos['y']
-                            })
-                    print(f"Wrote final {len(self.mouse_positions)} entries to CSV")
-                except Exception as e:
-                    print(f"Error writing final CSV data: {e}")
+        # Wake the encoder and wait for it to drain the frame buffer
+        print("Waiting for frames to finish encoding...")
+        self.frames_available.set()
+        self.encoder_thread.join(timeout=30)
+        if self.encoder_thread.is_alive():
+            print("Encoder didn't finish draining the frame buffer in time")
+        
+        # Write remaining CSV data. The capture thread owns the cursor ring and
+        # the CSV file, so only touch them once it has exited
+        if self.capture_thread.is_alive():
+            print("Capture thread didn't stop in time, skipping final CSV flush")
+        else:
+            remaining = self._flush_csv()
+            if remaining:
+                print(f"Wrote final {remaining} entries to CSV")
+            
+            try:
+                self.csv_fh.close()
+            except Exception as e:
+                print(f"Error closing CSV file: {e}")
         
         # Wait for FFmpeg to finish
         print("Waiting for video encoding to complete...")
@@ -442,6 +675,10 @@ if __name__ == "__main__":
                         help='Video quality preset (default: low)')
     parser.add_argument('--output-dir', type=str, default='__cursor_data',
                         help='Output directory (default: __cursor_data)')
+    parser.add_argument('--encoder', type=str, default='vp9',
+                        choices=['vp9', 'videotoolbox'],
+                        help='vp9 (software, transparent corners) or videotoolbox '
+                             '(hardware H.264, much lower CPU) (default: vp9)')
     args = parser.parse_args()
     
     # Generate timestamp-based tag if none provided
@@ -455,7 +692,8 @@ if __name__ == "__main__":
         output_dir=args.output_dir,
         tag=args.tag,
         video_quality=args.quality,
-        fps=args.fps
+        fps=args.fps,
+        hwaccel=args.encoder == 'videotoolbox'
     )
     
     # Handle clean shutdown
@@ -5,6 +5,7 @@ import { MousePointer2 } from "lucide-react";
 
 function AppVideo() {
   const [availableTags, setAvailableTags] = useState([]);
+  const [videoFiles, setVideoFiles] = useState({});
   const [selectedTag, setSelectedTag] = useState("");
   const [timelineData, setTimelineData] = useState([]);
   const [videoSrc, setVideoSrc] = useState("");
@@ -31,6 +32,7 @@ function AppVideo() {
       }
       const data = await response.json();
       setAvailableTags(data.tags);
+      setVideoFiles(data.videos || {});
 
       // Auto-select the first tag if available
       if (data.tags.length > 0) {
@@ -58,22 +60,38 @@ function AppVideo() {
       }
 
       const text = await response.text();
-      const lines = text.trim().split("\n").slice(1); // Skip header
+      const [header, ...lines] = text.trim().split("\n");
+
+      // Look columns up by name: older recordings also have a datetime column
+      const columns = header.trim().split(",");
+      const col = (name) => {
+        const index = columns.indexOf(name);
+        if (index === -1) {
+          throw new Error(`CSV file is missing the "${name}" column`);
+        }
+        return index;
+      };
+      const frameCol = col("frame_number");
+      const tsCol = col("timestamp");
+      const videoTsCol = col("video_timestamp");
+      const xCol = col("x");
+      const yCol = col("y");
 
       const data = lines.map((line) => {
-        const [frame_num, ts, dt, video_ts, x, y] = line.split(",");
+        const fields = line.split(",");
         return {
-          frame_number: parseInt(frame_num),
-          timestamp: parseFloat(ts),
-          datetime: dt,
-          video_timestamp: parseFloat(video_ts),
-          x: parseFloat(x),
-          y: parseFloat(y),
+          frame_number: parseInt(fields[frameCol]),
+          timestamp: parseFloat(fields[tsCol]),
+          video_timestamp: parseFloat(fields[videoTsCol]),
+          x: parseFloat(fields[xCol]),
+          y: parseFloat(fields[yCol]),
         };
       });
 
       setTimelineData(data);
-      setVideoSrc(`/__cursor_data/screen_capture_${tag}.webm`);
+      setVideoSrc(
+        `/__cursor_data/${videoFiles[tag] || `screen_capture_${tag}.webm`}`
+      );
       setLoading(false);
     } catch (error) {
       console.error("Error loading data:", error);
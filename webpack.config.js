@@ -57,32 +57,23 @@ module.exports = {
         try {
           const files = fs.readdirSync(cursorDataDir);
 
-          // Extract tags from video files (screen_capture_<tag>.webm)
-          const tags = files
-            .filter(
-              (file) =>
-                file.startsWith("screen_capture_") && file.endsWith(".webm")
-            )
-            .map((file) => {
-              // Remove "screen_capture_" prefix and ".webm" suffix
-              return file.slice(15, -5);
-            })
-            .sort((a, b) => {
-              // Sort by modification time, newest first
-              const aPath = path.join(
-                cursorDataDir,
-                `screen_capture_${a}.webm`
-              );
-              const bPath = path.join(
-                cursorDataDir,
-                `screen_capture_${b}.webm`
-              );
-              const aStat = fs.statSync(aPath);
-              const bStat = fs.statSync(bPath);
-              return bStat.mtime - aStat.mtime;
-            });
+          // Extract tags from video files (screen_capture_<tag>.webm or .mp4)
+          const videos = {};
+          files.forEach((file) => {
+            const match = file.match(/^screen_capture_(.+)\.(webm|mp4)$/);
+            if (match) {
+              videos[match[1]] = file;
+            }
+          });
 
-          res.json({ tags });
+          const tags = Object.keys(videos).sort((a, b) => {
+            // Sort by modification time, newest first
+            const aStat = fs.statSync(path.join(cursorDataDir, videos[a]));
+            const bStat = fs.statSync(path.join(cursorDataDir, videos[b]));
+            return bStat.mtime - aStat.mtime;
+          });
+
+          res.json({ tags, videos });
         } catch (error) {
           console.error("Error reading tags:", error);
           res.status(500).json({ error: "Failed to read tags" });
@@ -93,6 +84,11 @@ module.exports = {
     },
   },
   watchOptions: {
-    ignored: ["**/node_modules", "**/__cursor_data/**/*.png"],
+    ignored: [
+      "**/node_modules",
+      "**/__cursor_data/**/*.png",
+      "**/__cursor_data/**/*.jpg",
+      "**/__cursor_data/**/*.webp",
+    ],
   },
 };